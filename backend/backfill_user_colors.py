@@ -0,0 +1,27 @@
+"""One-off migration: store a color on users created before it was saved at registration.
+
+Run once from the backend directory after deploying:
+
+    python backfill_user_colors.py
+"""
+import asyncio
+
+from pymongo import UpdateOne
+
+from server import client, db, logger, user_color
+
+
+async def backfill_user_colors():
+    ops = []
+    async for u in db.users.find({"color": {"$in": ["", None]}}, {"_id": 1}):
+        ops.append(UpdateOne({"_id": u["_id"]}, {"$set": {"color": user_color(str(u["_id"]))}}))
+    if ops:
+        await db.users.bulk_write(ops, ordered=False)
+    logger.info(f"Backfilled color for {len(ops)} users")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(backfill_user_colors())
+    finally:
+        client.close()
@@ -1,22 +1,39 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from redis import asyncio as aioredis
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Set
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 from bson import ObjectId
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from shapely.geometry import shape, mapping, LineString as ShapelyLine, Polygon as ShapelyPolygon, MultiPolygon
-from shapely.ops import transform, unary_union
+from shapely.geometry import shape, mapping, Polygon as ShapelyPolygon, MultiPolygon
+from shapely.ops import unary_union
+from shapely.strtree import STRtree
 from pyproj import Transformer
+import msgspec
+import numpy as np
+import orjson
+import shapely
+try:
+    from utils_numba import haversine_sum
+except ImportError:  # numba is optional; the NumPy route-distance path is used instead
+    haversine_sum = None
+import asyncio
 import hashlib
 import math
 import json
 import os
 import logging
+import re
 import uuid
 
 ROOT_DIR = Path(__file__).parent
@@ -24,17 +41,38 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# Keep warm connections open so the first requests don't pay connect latency
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get("MONGO_MAX_POOL_SIZE", 100)),
+    minPoolSize=int(os.environ.get("MONGO_MIN_POOL_SIZE", 10)),
+)
 db = client[os.environ['DB_NAME']]
 
+# Redis response cache (disabled when REDIS_URL is not set)
+redis_url = os.environ.get("REDIS_URL")
+redis_client = aioredis.from_url(redis_url) if redis_url else None
+PROFILE_CACHE_TTL = 60
+LEADERBOARD_CACHE_TTL = 10
+
+# Comma-separated browser origins allowed by CORS; "*" (the default) allows any
+CORS_ORIGINS = [origin.strip() for origin in os.environ.get("CORS_ORIGINS", "*").split(",") if origin.strip()]
+
 # Auth config
 SECRET_KEY = os.environ.get("SECRET_KEY", "superacres-secret-2025-game")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 30
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2 for new hashes; bcrypt hashes still verify and are upgraded on login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
 
 # FastAPI app
-app = FastAPI(title="SUPERACRES API")
+app = FastAPI(title="SUPERACRES API", default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # Logging
@@ -46,15 +84,54 @@ logger = logging.getLogger(__name__)
 # GEO UTILITIES
 # ============================================================
 
-def geojson_to_list(obj):
-    """Recursively convert tuples to lists for JSON serialization."""
-    if isinstance(obj, tuple):
-        return [geojson_to_list(item) for item in obj]
-    elif isinstance(obj, list):
-        return [geojson_to_list(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: geojson_to_list(v) for k, v in obj.items()}
-    return obj
+# Transformers are expensive to build (PROJ parses the CRS definitions),
+# so create them once at import and reuse them on every call.
+_TO_EQUAL_AREA = Transformer.from_crs("EPSG:4326", "EPSG:6933", always_xy=True)
+
+# Approximate meters per degree of latitude, for converting small tolerances
+_M_PER_DEG_LAT = 111_320.0
+
+# Douglas-Peucker tolerances: GPS jitter is dropped before buffering (as a
+# fraction of the buffer radius) and merged territories are thinned (meters)
+ROUTE_SIMPLIFY_RATIO = 0.1
+TERRITORY_SIMPLIFY_M = 2.0
+
+# Segments per quarter circle on buffer caps; GEOS defaults to 16
+BUFFER_QUAD_SEGS = 6
+
+
+def _meters_per_degree(lat: float) -> np.ndarray:
+    """[lng, lat] meters per degree on the WGS84 ellipsoid at the given latitude."""
+    phi = math.radians(lat)
+    return np.array([
+        111_412.84 * math.cos(phi) - 93.5 * math.cos(3 * phi),
+        111_132.92 - 559.82 * math.cos(2 * phi) + 1.175 * math.cos(4 * phi),
+    ])
+
+
+def _coords_to_list(coords):
+    """Convert nested coordinate tuples to lists, converting rings in one step."""
+    if not coords:
+        return []
+    if isinstance(coords[0], (int, float)):
+        return list(coords)
+    if isinstance(coords[0][0], (int, float)):
+        return list(map(list, coords))
+    return [_coords_to_list(c) for c in coords]
+
+
+def geojson_to_list(obj: Dict) -> Dict:
+    """Convert the coordinate tuples of a shapely mapping to lists."""
+    if "geometries" in obj:
+        return {**obj, "geometries": [geojson_to_list(g) for g in obj["geometries"]]}
+    return {**obj, "coordinates": _coords_to_list(obj["coordinates"])}
+
+
+def _project(geom, transformer: Transformer):
+    """Reproject all vertices of a geometry in one vectorized PROJ call."""
+    return shapely.transform(
+        geom, lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1]))
+    )
 
 
 def shapely_to_geojson(geom):
@@ -62,35 +139,87 @@ def shapely_to_geojson(geom):
     return geojson_to_list(mapping(geom))
 
 
-def buffer_route_to_polygon(coordinates: List[List[float]], buffer_km: float = 0.05) -> Optional[Dict]:
+def buffer_routes_to_polygons(routes: List[List[List[float]]], buffer_km: float = 0.05) -> List[Tuple[Optional[Dict], float]]:
+    """Buffer many routes into territory polygons with vectorized shapely calls.
+    routes: list of [[lng, lat], ...] coordinate lists in GeoJSON order
+    Returns a (GeoJSON Polygon dict, area in km²) pair per route, or (None, 0.0)
+    for routes that could not be buffered.
+    """
+    results = [(None, 0.0)] * len(routes)
+    valid = [i for i, route in enumerate(routes) if route is not None and len(route) >= 2]
+    if not valid:
+        return results
+    try:
+        # Project each route to a local equirectangular plane (meters) centred
+        # on the route. Over a run-sized extent this is more accurate than Web
+        # Mercator, which stretches distances by 1/cos(lat), and needs no PROJ.
+        arrays = [np.asarray(routes[i], dtype=np.float64) for i in valid]
+        origins = np.array([arr.mean(axis=0) for arr in arrays])
+        scales = np.array([_meters_per_degree(origin[1]) for origin in origins])
+        line_index = np.repeat(np.arange(len(arrays)), [len(arr) for arr in arrays])
+        coords = np.concatenate(arrays)
+        lines = shapely.linestrings((coords - origins[line_index]) * scales[line_index], indices=line_index)
+
+        buffer_m = buffer_km * 1000
+        lines = shapely.simplify(lines, buffer_m * ROUTE_SIMPLIFY_RATIO, preserve_topology=False)
+        buffered = shapely.buffer(lines, buffer_m, quad_segs=BUFFER_QUAD_SEGS)
+        areas = shapely.area(buffered) / 1_000_000  # m² to km²
+
+        # Map every vertex back to WGS84 in one pass
+        xy, geom_index = shapely.get_coordinates(buffered, return_index=True)
+        buffered = shapely.set_coordinates(buffered, xy / scales[geom_index] + origins[geom_index])
+        for i, geom, area in zip(valid, buffered, areas):
+            results[i] = (shapely_to_geojson(geom), float(area))
+    except Exception as e:
+        logger.error(f"Buffer error: {e}")
+    return results
+
+
+def buffer_route_to_polygon(coordinates: List[List[float]], buffer_km: float = 0.05) -> Tuple[Optional[Dict], float]:
     """Create a territory polygon by buffering a route linestring.
     coordinates: [[lng, lat], ...] in GeoJSON order
-    Returns GeoJSON Polygon dict.
+    Returns (GeoJSON Polygon dict, area in km²), or (None, 0.0) on failure.
+    The area is measured on the projected buffer, so no second reprojection is needed.
     """
     if not coordinates or len(coordinates) < 2:
         logger.warning("Not enough coordinates for buffer")
-        return None
+        return None, 0.0
+    return buffer_routes_to_polygons([coordinates], buffer_km)[0]
+
+
+def _ring_area_m2(ring: np.ndarray, origin: np.ndarray, scale: np.ndarray) -> float:
+    """Shoelace area of a closed [lng, lat] ring in a local equirectangular plane."""
+    x, y = ((ring - origin) * scale).T
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def calculate_area_km2_from_shape(geom) -> float:
+    """Calculate area of a shapely geometry (WGS84) in km²."""
     try:
-        line = ShapelyLine(coordinates)
-        # Project to Web Mercator (meters) for accurate buffer
-        to_mercator = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
-        to_wgs84 = Transformer.from_crs("EPSG:3857", "EPSG:4326", always_xy=True)
-        line_m = transform(to_mercator.transform, line)
-        buffered_m = line_m.buffer(buffer_km * 1000)  # km to meters
-        buffered_wgs84 = transform(to_wgs84.transform, buffered_m)
-        return shapely_to_geojson(buffered_wgs84)
+        if geom.geom_type == "Polygon" and not geom.is_empty:
+            # Single polygons are small enough for a local plane: pure array math
+            exterior = shapely.get_coordinates(geom.exterior)
+            origin = exterior.mean(axis=0)
+            scale = _meters_per_degree(origin[1])
+            area_m2 = _ring_area_m2(exterior, origin, scale) - sum(
+                _ring_area_m2(shapely.get_coordinates(ring), origin, scale) for ring in geom.interiors
+            )
+            return area_m2 / 1_000_000  # m² to km²
+        projected = _project(geom, _TO_EQUAL_AREA)
+        return projected.area / 1_000_000  # m² to km²
     except Exception as e:
-        logger.error(f"Buffer error: {e}")
-        return None
+        logger.error(f"Area calc error: {e}")
+        return 0.0
 
 
 def calculate_area_km2(geojson_polygon: Dict) -> float:
-    """Calculate area of a GeoJSON polygon in km²."""
+    """Calculate area of a GeoJSON polygon in km².
+
+    Parses the GeoJSON first; prefer calculate_area_km2_from_shape when a
+    shapely geometry is already at hand.
+    """
     try:
-        geom = shape(geojson_polygon)
-        to_equal_area = Transformer.from_crs("EPSG:4326", "EPSG:6933", always_xy=True)
-        projected = transform(to_equal_area.transform, geom)
-        return projected.area / 1_000_000  # m² to km²
+        return calculate_area_km2_from_shape(shape(geojson_polygon))
     except Exception as e:
         logger.error(f"Area calc error: {e}")
         return 0.0
@@ -109,10 +238,14 @@ def haversine_distance(coord1: List[float], coord2: List[float]) -> float:
 
 def calculate_route_distance_km(coordinates: List[List[float]]) -> float:
     """Total distance of a route in km."""
-    total = 0.0
-    for i in range(len(coordinates) - 1):
-        total += haversine_distance(coordinates[i], coordinates[i + 1])
-    return total
+    if len(coordinates) < 2:
+        return 0.0
+    rad = np.radians(np.asarray(coordinates, dtype=np.float64))
+    lng, lat = rad[:, 0], rad[:, 1]
+    if haversine_sum is not None:
+        return float(haversine_sum(np.ascontiguousarray(lat), np.ascontiguousarray(lng)))
+    a = np.sin(np.diff(lat) / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lng) / 2) ** 2
+    return float(6371 * 2 * np.arcsin(np.sqrt(np.clip(a, 0, 1))).sum())
 
 
 def user_color(user_id: str) -> str:
@@ -126,12 +259,15 @@ def user_color(user_id: str) -> str:
 # AUTH UTILITIES
 # ============================================================
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+# Hashing is CPU-bound, so run it in a worker thread to keep the event loop free
+
+async def hash_password(password: str) -> str:
+    return await asyncio.to_thread(pwd_context.hash, password)
 
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+async def verify_password(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Return (valid, new_hash); new_hash is set when the stored hash needs upgrading."""
+    return await asyncio.to_thread(pwd_context.verify_and_update, plain, hashed)
 
 
 def create_access_token(user_id: str, username: str) -> str:
@@ -156,27 +292,199 @@ async def get_current_user(authorization: str = Header(...)):
         raise HTTPException(status_code=401, detail=f"Token error: {str(e)}")
 
 
+_OBJECT_ID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+
+def parse_object_id(value: str) -> ObjectId:
+    """Validate a 24-hex id before it reaches Mongo; malformed ids are a 400."""
+    if not _OBJECT_ID_RE.fullmatch(value):
+        raise HTTPException(status_code=400, detail="Invalid id")
+    return ObjectId(value)
+
+
+def user_id_path(user_id: str) -> ObjectId:
+    """Path dependency for routes with a {user_id} segment."""
+    return parse_object_id(user_id)
+
+
+def run_id_path(run_id: str) -> ObjectId:
+    """Path dependency for routes with a {run_id} segment."""
+    return parse_object_id(run_id)
+
+
 # ============================================================
 # SERIALIZATION
 # ============================================================
 
+def _identity(value):
+    return value
+
+
+def _serialize_list(values: List) -> List:
+    """Serialize embedded documents and ObjectIds in a list; other items pass through."""
+    return [serialize_doc(v) if type(v) is dict else (str(v) if type(v) is ObjectId else v) for v in values]
+
+
+# Converters keyed by exact value type; embedded GeoJSON dicts pass through as-is
+_SERIALIZERS = {
+    ObjectId: str,
+    datetime: datetime.isoformat,
+    list: _serialize_list,
+}
+
+
 def serialize_doc(doc: Dict) -> Dict:
     """Convert MongoDB document for API response."""
     if doc is None:
         return None
-    result = {}
-    for key, value in doc.items():
-        if key == '_id':
-            result['id'] = str(value)
-        elif isinstance(value, ObjectId):
-            result[key] = str(value)
-        elif isinstance(value, datetime):
-            result[key] = value.isoformat()
-        elif isinstance(value, list):
-            result[key] = [serialize_doc(v) if isinstance(v, dict) else (str(v) if isinstance(v, ObjectId) else v) for v in value]
-        else:
-            result[key] = value
-    return result
+    get_converter = _SERIALIZERS.get
+    return {
+        ('id' if key == '_id' else key): get_converter(type(value), _identity)(value)
+        for key, value in doc.items()
+    }
+
+
+# ============================================================
+# QUERY BATCHING
+# ============================================================
+
+class MongoBatcher:
+    """Coalesce concurrent find-by-_id lookups into a single $in query.
+
+    Lookups arriving within `window` seconds of the first one share one
+    round-trip; each caller gets its own document (or None) back.
+    """
+
+    def __init__(self, collection, projection: Optional[Dict] = None, window: float = 0.002):
+        self.collection = collection
+        self.projection = projection
+        self.window = window
+        self._pending: Dict[ObjectId, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def get(self, oid: ObjectId) -> Optional[Dict]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(oid, []).append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        try:
+            docs = await self.collection.find(
+                {"_id": {"$in": list(pending)}}, projection=self.projection
+            ).to_list(len(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        docs_by_id = {doc["_id"]: doc for doc in docs}
+        for oid, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(docs_by_id.get(oid))
+
+
+# Fields served by /auth/me and /users/{id}/profile; skips passwordHash etc.
+PROFILE_PROJECTION = {
+    "username": 1, "email": 1, "color": 1, "totalAreaKm2": 1, "totalDistanceKm": 1,
+    "totalAreaKm2Display": 1, "totalDistanceKmDisplay": 1, "totalRuns": 1, "globalRank": 1, "currentStreak": 1, "longestStreak": 1,
+    "createdAt": 1, "createdAtIso": 1,
+}
+
+user_batcher = MongoBatcher(db.users, projection=PROFILE_PROJECTION)
+
+# Fields the map needs to draw and label a territory
+TERRITORY_PROJECTION = {"userId": 1, "username": 1, "polygon": 1, "areaKm2": 1, "color": 1, "capturedAt": 1}
+
+LEADERBOARD_PROJECTION = {
+    "username": 1, "totalAreaKm2": 1, "totalDistanceKm": 1,
+    "totalAreaKm2Display": 1, "totalDistanceKmDisplay": 1, "totalRuns": 1, "color": 1,
+}
+
+# Update-pipeline stage that refreshes the pre-rounded totals from the raw ones,
+# so reads return the stored display values instead of rounding per request
+DISPLAY_TOTALS_STAGE = {"$set": {
+    "totalAreaKm2Display": {"$round": ["$totalAreaKm2", 4]},
+    "totalDistanceKmDisplay": {"$round": ["$totalDistanceKm", 2]},
+}}
+
+
+# ============================================================
+# RESPONSE CACHE
+# ============================================================
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """Return a cached JSON body, or None on a miss or when caching is off."""
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.error(f"Cache read error: {e}")
+        return None
+
+
+async def cache_set(key: str, body: bytes, ttl: int):
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(key, body, ex=ttl)
+    except Exception as e:
+        logger.error(f"Cache write error: {e}")
+
+
+async def invalidate_user_cache(*user_ids: str):
+    """Drop cached profile and /auth/me bodies after a user's data changes."""
+    if redis_client is None or not user_ids:
+        return
+    keys = [f"{prefix}:{uid}" for uid in user_ids for prefix in ("profile", "me")]
+    try:
+        await redis_client.delete(*keys)
+    except Exception as e:
+        logger.error(f"Cache invalidation error: {e}")
+
+
+async def stream_json_array(cursor):
+    """Encode cursor documents one at a time as a JSON array.
+
+    A query error ends the array early, so clients always receive valid JSON.
+    """
+    yield b"["
+    separator = b""
+    try:
+        async for doc in cursor:
+            yield separator + orjson.dumps(serialize_doc(doc))
+            separator = b","
+    except Exception as e:
+        logger.error(f"Streaming query error: {e}")
+    yield b"]"
+
+
+def json_body_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def created_at_iso(user: Dict) -> str:
+    """ISO creation time, falling back to formatting createdAt for older users."""
+    iso = user.get("createdAtIso")
+    if iso is None:
+        created_at = user.get("createdAt")
+        iso = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at or "")
+    return iso
+
+
+def display_total(user: Dict, field: str, ndigits: int) -> float:
+    """Pre-rounded total stored as <field>Display, rounding here only for older users."""
+    value = user.get(field + "Display")
+    if value is None:
+        value = round(user.get(field, 0), ndigits)
+    return value
 
 
 # ============================================================
@@ -198,16 +506,33 @@ class StartRunRequest(BaseModel):
     pass
 
 
-class EndRunRequest(BaseModel):
+# ============================================================
+# MSGSPEC REQUEST BODIES (hot write paths)
+# ============================================================
+
+class EndRunRequest(msgspec.Struct):
     runId: str
-    coordinates: List[List[float]]  # [[lng, lat], ...]
+    coordinates: List[Tuple[float, float]]  # [[lng, lat], ...]
 
 
-class UpdateProfileRequest(BaseModel):
+class UpdateProfileRequest(msgspec.Struct):
     username: Optional[str] = None
     avatarUrl: Optional[str] = None
 
 
+def msgspec_body(struct_type):
+    """Dependency decoding the JSON body straight into a msgspec Struct."""
+    decoder = msgspec.json.Decoder(struct_type)
+
+    async def decode_body(request: Request):
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    return decode_body
+
+
 # ============================================================
 # STARTUP: Create indexes
 # ============================================================
@@ -217,9 +542,12 @@ async def startup_event():
     try:
         await db.users.create_index("email", unique=True)
         await db.users.create_index("username")
+        await db.users.create_index([("totalAreaKm2", -1)])
         await db.territories.create_index([("polygon", "2dsphere")])
         await db.runs.create_index([("routeCoordinates", "2dsphere")])
-        await db.runs.create_index("userId")
+        # Serves the per-user run history filter and endedAt sort; its userId
+        # prefix also covers plain userId lookups
+        await db.runs.create_index([("userId", 1), ("status", 1), ("endedAt", -1)])
         await db.territories.create_index("userId")
         await db.badges.create_index("userId")
         await db.notifications.create_index("userId")
@@ -232,6 +560,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+    if redis_client is not None:
+        await redis_client.aclose()
 
 
 # ============================================================
@@ -248,27 +578,32 @@ async def register(req: RegisterRequest):
     if existing_username:
         raise HTTPException(status_code=400, detail="Username already taken")
 
-    # Create user
+    # Create user; the id is generated up front so the color can be stored
+    # with the insert instead of in a follow-up update
+    user_oid = ObjectId()
+    user_id = str(user_oid)
+    color = user_color(user_id)
+    created_at = datetime.utcnow()
     user = {
+        "_id": user_oid,
         "username": req.username,
         "email": req.email,
-        "passwordHash": hash_password(req.password),
+        "passwordHash": await hash_password(req.password),
         "totalAreaKm2": 0.0,
         "totalDistanceKm": 0.0,
+        "totalAreaKm2Display": 0.0,
+        "totalDistanceKmDisplay": 0.0,
         "totalRuns": 0,
         "globalRank": 0,
-        "color": "",  # will be set after insert
+        "color": color,
         "currentStreak": 0,
         "longestStreak": 0,
         "lastRunDate": None,
-        "createdAt": datetime.utcnow()
+        "createdAt": created_at,
+        # Stored pre-formatted so profile reads never call isoformat()
+        "createdAtIso": created_at.isoformat()
     }
-    result = await db.users.insert_one(user)
-    user_id = str(result.inserted_id)
-
-    # Set color based on user_id
-    color = user_color(user_id)
-    await db.users.update_one({"_id": result.inserted_id}, {"$set": {"color": color}})
+    await db.users.insert_one(user)
 
     token = create_access_token(user_id, req.username)
     return {
@@ -290,8 +625,11 @@ async def login(req: LoginRequest):
     user = await db.users.find_one({"email": req.email})
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    if not verify_password(req.password, user["passwordHash"]):
+    valid, new_hash = await verify_password(req.password, user["passwordHash"])
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        await db.users.update_one({"_id": user["_id"]}, {"$set": {"passwordHash": new_hash}})
 
     user_id = str(user["_id"])
     token = create_access_token(user_id, user["username"])
@@ -301,7 +639,7 @@ async def login(req: LoginRequest):
             "id": user_id,
             "username": user["username"],
             "email": user["email"],
-            "color": user.get("color", user_color(user_id)),
+            "color": user["color"],
             "totalAreaKm2": user.get("totalAreaKm2", 0.0),
             "totalDistanceKm": user.get("totalDistanceKm", 0.0),
             "totalRuns": user.get("totalRuns", 0)
@@ -311,23 +649,30 @@ async def login(req: LoginRequest):
 
 @api_router.get("/auth/me")
 async def get_me(current_user: dict = Depends(get_current_user)):
-    user = await db.users.find_one({"_id": ObjectId(current_user["user_id"])})
+    cache_key = f"me:{current_user['user_id']}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return json_body_response(cached)
+
+    user = await user_batcher.get(ObjectId(current_user["user_id"]))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user_id = str(user["_id"])
-    return {
-        "id": user_id,
+    g = user.get
+    body = orjson.dumps({
+        "id": str(user["_id"]),
         "username": user["username"],
         "email": user["email"],
-        "color": user.get("color", user_color(user_id)),
-        "totalAreaKm2": user.get("totalAreaKm2", 0.0),
-        "totalDistanceKm": user.get("totalDistanceKm", 0.0),
-        "totalRuns": user.get("totalRuns", 0),
-        "globalRank": user.get("globalRank", 0),
-        "currentStreak": user.get("currentStreak", 0),
-        "longestStreak": user.get("longestStreak", 0),
-        "createdAt": user["createdAt"].isoformat() if isinstance(user.get("createdAt"), datetime) else str(user.get("createdAt", ""))
-    }
+        "color": user["color"],
+        "totalAreaKm2": g("totalAreaKm2", 0.0),
+        "totalDistanceKm": g("totalDistanceKm", 0.0),
+        "totalRuns": g("totalRuns", 0),
+        "globalRank": g("globalRank", 0),
+        "currentStreak": g("currentStreak", 0),
+        "longestStreak": g("longestStreak", 0),
+        "createdAt": created_at_iso(user)
+    })
+    await cache_set(cache_key, body, PROFILE_CACHE_TTL)
+    return json_body_response(body)
 
 
 # ============================================================
@@ -415,12 +760,17 @@ async def start_run(current_user: dict = Depends(get_current_user)):
 
 
 @api_router.post("/runs/end")
-async def end_run(req: EndRunRequest, current_user: dict = Depends(get_current_user)):
+async def end_run(
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user),
+    req: EndRunRequest = Depends(msgspec_body(EndRunRequest))
+):
     user_id = current_user["user_id"]
     username = current_user["username"]
 
     # Validate run
-    run = await db.runs.find_one({"_id": ObjectId(req.runId), "userId": ObjectId(user_id)})
+    run_oid = parse_object_id(req.runId)
+    run = await db.runs.find_one({"_id": run_oid, "userId": ObjectId(user_id)})
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
 
@@ -435,15 +785,16 @@ async def end_run(req: EndRunRequest, current_user: dict = Depends(get_current_u
     avg_pace = (duration_seconds / 60) / distance_km if distance_km > 0 else 0.0
 
     # Create territory polygon
-    new_polygon_geojson = buffer_route_to_polygon(coordinates, buffer_km=0.05)
+    new_polygon_geojson, territory_gained_km2 = buffer_route_to_polygon(coordinates, buffer_km=0.05)
     if not new_polygon_geojson:
         raise HTTPException(status_code=400, detail="Could not compute territory polygon")
 
-    territory_gained_km2 = calculate_area_km2(new_polygon_geojson)
     new_shape = shape(new_polygon_geojson)
 
     # Find intersecting territories from OTHER users
     stolen_from = []
+    # Previous owners' area decrements are deferred until after the response
+    user_ops = []
     try:
         cursor = db.territories.find({
             "polygon": {
@@ -455,44 +806,62 @@ async def end_run(req: EndRunRequest, current_user: dict = Depends(get_current_u
         })
         other_territories = await cursor.to_list(length=200)
 
+        # Collect territory writes and flush them in one bulk_write;
+        # losses[i] is the owner charge for territory_ops[i]
+        territory_ops = []
+        losses = []
         for territory in other_territories:
             their_shape = shape(territory["polygon"])
             # Subtract overlap from their territory
             try:
+                stolen_area_km2 = calculate_area_km2_from_shape(their_shape.intersection(new_shape))
                 remaining = their_shape.difference(new_shape)
-                stolen_area_km2 = calculate_area_km2(shapely_to_geojson(their_shape.intersection(new_shape)))
 
                 if remaining.is_empty or remaining.area < 1e-10:
                     # Completely stolen - delete their territory
-                    await db.territories.delete_one({"_id": territory["_id"]})
+                    territory_ops.append(DeleteOne({"_id": territory["_id"]}))
                 else:
                     # Partially stolen - update their territory
-                    remaining_geojson = shapely_to_geojson(remaining)
-                    remaining_area = calculate_area_km2(remaining_geojson)
-                    await db.territories.update_one(
+                    territory_ops.append(UpdateOne(
                         {"_id": territory["_id"]},
                         {"$set": {
-                            "polygon": remaining_geojson,
-                            "areaKm2": remaining_area,
+                            "polygon": shapely_to_geojson(remaining),
+                            "areaKm2": calculate_area_km2_from_shape(remaining),
                             "lastUpdatedAt": datetime.utcnow()
                         }}
-                    )
-
-                # Update previous owner's total area
-                if stolen_area_km2 > 0:
-                    await db.users.update_one(
-                        {"_id": territory["userId"]},
-                        {"$inc": {"totalAreaKm2": -stolen_area_km2}}
-                    )
-                    stolen_from.append({
-                        "userId": str(territory["userId"]),
-                        "username": territory.get("username", "unknown"),
-                        "areaKm2": round(stolen_area_km2, 6)
-                    })
+                    ))
+                losses.append((territory, stolen_area_km2))
             except Exception as e:
                 logger.error(f"Territory difference error: {e}")
                 continue
+
+        # Only owners whose territory write succeeded are charged and notified
+        failed = set()
+        if territory_ops:
+            try:
+                await db.territories.bulk_write(territory_ops, ordered=False)
+            except BulkWriteError as e:
+                failed = {err["index"] for err in e.details.get("writeErrors", [])}
+                logger.error(f"Territory write error: {e}")
+
+        for i, (territory, stolen_area_km2) in enumerate(losses):
+            # Update previous owner's total area
+            if i in failed or stolen_area_km2 <= 0:
+                continue
+            user_ops.append(UpdateOne(
+                {"_id": territory["userId"]},
+                [{"$set": {"totalAreaKm2": {"$subtract": ["$totalAreaKm2", stolen_area_km2]}}},
+                 DISPLAY_TOTALS_STAGE]
+            ))
+            stolen_from.append({
+                "userId": str(territory["userId"]),
+                "username": territory.get("username", "unknown"),
+                "areaKm2": round(stolen_area_km2, 6)
+            })
     except Exception as e:
+        # Nothing is charged when the territory writes did not go through
+        stolen_from = []
+        user_ops = []
         logger.error(f"Territory query error: {e}")
 
     # Merge with user's existing territories if adjacent/overlapping
@@ -501,21 +870,30 @@ async def end_run(req: EndRunRequest, current_user: dict = Depends(get_current_u
         user_territories_cursor = db.territories.find({"userId": ObjectId(user_id)})
         user_territories = await user_territories_cursor.to_list(length=500)
 
-        final_shape = new_shape
+        to_merge = [new_shape]
         territory_ids_to_delete = []
 
-        for ut in user_territories:
-            ut_shape = shape(ut["polygon"])
-            if ut_shape.intersects(final_shape) or ut_shape.distance(final_shape) < 0.001:
-                final_shape = unary_union([final_shape, ut_shape])
-                territory_ids_to_delete.append(ut["_id"])
+        # Index the user's territories and only test those whose bounding box
+        # comes within the merge distance of the new shape
+        ut_shapes = [shape(ut["polygon"]) for ut in user_territories]
+        tree = STRtree(ut_shapes)
+        min_x, min_y, max_x, max_y = new_shape.bounds
+        search_box = shapely.box(min_x - 0.001, min_y - 0.001, max_x + 0.001, max_y + 0.001)
+        for idx in np.sort(tree.query(search_box)):
+            ut_shape = ut_shapes[idx]
+            if ut_shape.intersects(new_shape) or ut_shape.distance(new_shape) < 0.001:
+                to_merge.append(ut_shape)
+                territory_ids_to_delete.append(user_territories[idx]["_id"])
+
+        # One cascaded union instead of rebuilding the topology per neighbour
+        final_shape = unary_union(to_merge).simplify(TERRITORY_SIMPLIFY_M / _M_PER_DEG_LAT)
 
         # Delete old user territories that were merged
         if territory_ids_to_delete:
             await db.territories.delete_many({"_id": {"$in": territory_ids_to_delete}})
 
         final_polygon_geojson = shapely_to_geojson(final_shape)
-        final_area_km2 = calculate_area_km2(final_polygon_geojson)
+        final_area_km2 = calculate_area_km2_from_shape(final_shape)
 
     except Exception as e:
         logger.error(f"Territory union error: {e}")
@@ -532,12 +910,12 @@ async def end_run(req: EndRunRequest, current_user: dict = Depends(get_current_u
         "capturedAt": datetime.utcnow(),
         "lastUpdatedAt": datetime.utcnow()
     }
-    territory_result = await db.territories.insert_one(territory_doc)
 
-    # Update run record
+    # Save territory, complete the run and bump user stats concurrently; the
+    # writes touch different documents and the user update is a pure $inc
     route_geojson = {"type": "LineString", "coordinates": coordinates}
-    await db.runs.update_one(
-        {"_id": ObjectId(req.runId)},
+    run_update = db.runs.update_one(
+        {"_id": run_oid},
         {"$set": {
             "status": "completed",
             "routeCoordinates": route_geojson,
@@ -551,19 +929,21 @@ async def end_run(req: EndRunRequest, current_user: dict = Depends(get_current_u
         }}
     )
 
-    # Update user stats
-    await db.users.update_one(
+    user_update = db.users.find_one_and_update(
         {"_id": ObjectId(user_id)},
         {"$inc": {
             "totalAreaKm2": territory_gained_km2,
             "totalDistanceKm": distance_km,
             "totalRuns": 1
-        }}
+        }},
+        return_document=ReturnDocument.AFTER
+    )
+    _, _, user_doc = await asyncio.gather(
+        db.territories.insert_one(territory_doc), run_update, user_update
     )
 
     # Streak calculation
     today = datetime.utcnow().date()
-    user_doc = await db.users.find_one({"_id": ObjectId(user_id)})
     last_run_date = user_doc.get("lastRunDate")
 
     if last_run_date:
@@ -589,27 +969,17 @@ async def end_run(req: EndRunRequest, current_user: dict = Depends(get_current_u
     longest = max(new_streak, user_doc.get("longestStreak", 0))
     await db.users.update_one(
         {"_id": ObjectId(user_id)},
-        {"$set": {"currentStreak": new_streak, "longestStreak": longest, "lastRunDate": datetime.utcnow()}}
+        [{"$set": {"currentStreak": new_streak, "longestStreak": longest, "lastRunDate": datetime.utcnow()}},
+         DISPLAY_TOTALS_STAGE]
     )
+    await invalidate_user_cache(user_id)
 
     # Check and award badges
     new_badges = await check_and_award_badges(user_id, stolen_count=len(stolen_from))
 
-    # Save notification for stolen territory owners
-    for stolen_info in stolen_from:
-        notification = {
-            "userId": ObjectId(stolen_info["userId"]),
-            "type": "territory_stolen",
-            "title": "Territory Stolen! ⚔️",
-            "body": f"@{username} just stole {round(stolen_info['areaKm2'] * 1000000)} m² of your territory!",
-            "data": {"stealerUsername": username, "areaKm2": stolen_info["areaKm2"]},
-            "read": False,
-            "createdAt": datetime.utcnow()
-        }
-        await db.notifications.insert_one(notification)
-
-    # Update global ranks
-    await update_global_ranks()
+    # Owner decrements, notifications and rank recompute run after the response
+    background_tasks.add_task(apply_territory_losses, username, stolen_from, user_ops)
+    background_tasks.add_task(schedule_rank_update, user_id, *(info["userId"] for info in stolen_from))
 
     return {
         "run": {
@@ -630,29 +1000,83 @@ async def end_run(req: EndRunRequest, current_user: dict = Depends(get_current_u
     }
 
 
+async def apply_territory_losses(stealer_username: str, stolen_from: List[Dict], user_ops: List[UpdateOne]):
+    """Decrement previous owners' area and notify them about stolen territory."""
+    try:
+        if user_ops:
+            await db.users.bulk_write(user_ops, ordered=False)
+            await invalidate_user_cache(*{info["userId"] for info in stolen_from})
+        notifications = [
+            {
+                "userId": ObjectId(stolen_info["userId"]),
+                "type": "territory_stolen",
+                "title": "Territory Stolen! ⚔️",
+                "body": f"@{stealer_username} just stole {round(stolen_info['areaKm2'] * 1000000)} m² of your territory!",
+                "data": {"stealerUsername": stealer_username, "areaKm2": stolen_info["areaKm2"]},
+                "read": False,
+                "createdAt": datetime.utcnow()
+            }
+            for stolen_info in stolen_from
+        ]
+        if notifications:
+            await db.notifications.insert_many(notifications, ordered=False)
+    except Exception as e:
+        logger.error(f"Territory loss update error: {e}")
+
+
+# Rank recomputes requested while one is already running coalesce into a
+# single follow-up pass instead of queueing one pass per finished run.
+_rank_update_task: Optional[asyncio.Task] = None
+_rank_update_pending = False
+# Users whose cached profile and /auth/me bodies must drop after the next pass
+_rank_update_users: Set[str] = set()
+
+
+async def _drain_rank_updates():
+    global _rank_update_pending
+    while _rank_update_pending:
+        _rank_update_pending = False
+        user_ids = list(_rank_update_users)
+        _rank_update_users.clear()
+        await update_global_ranks()
+        await invalidate_user_cache(*user_ids)
+
+
+async def schedule_rank_update(*user_ids: str):
+    """Request a global rank recompute without waiting for it.
+
+    The given users' cached bodies are invalidated once their new rank is written.
+    """
+    global _rank_update_task, _rank_update_pending
+    _rank_update_users.update(user_ids)
+    _rank_update_pending = True
+    if _rank_update_task is None or _rank_update_task.done():
+        _rank_update_task = asyncio.create_task(_drain_rank_updates())
+
+
 async def update_global_ranks():
-    """Recalculate global ranks based on totalAreaKm2."""
+    """Recalculate global ranks based on totalAreaKm2.
+
+    Ranks are computed and written back server-side in a single pipeline.
+    """
     try:
         pipeline = [
-            {"$sort": {"totalAreaKm2": -1}},
-            {"$group": {"_id": None, "users": {"$push": {"_id": "$_id", "area": "$totalAreaKm2"}}}}
+            {"$setWindowFields": {
+                "sortBy": {"totalAreaKm2": -1},
+                "output": {"globalRank": {"$documentNumber": {}}}
+            }},
+            {"$project": {"globalRank": 1}},
+            {"$merge": {"into": "users", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
         ]
-        result = await db.users.aggregate(pipeline).to_list(1)
-        if result:
-            users = result[0]["users"]
-            for i, u in enumerate(users):
-                await db.users.update_one(
-                    {"_id": u["_id"]},
-                    {"$set": {"globalRank": i + 1}}
-                )
+        await db.users.aggregate(pipeline).to_list(1)
     except Exception as e:
         logger.error(f"Rank update error: {e}")
 
 
 @api_router.get("/runs/{user_id}")
-async def get_user_runs(user_id: str, current_user: dict = Depends(get_current_user)):
+async def get_user_runs(user_oid: ObjectId = Depends(user_id_path), current_user: dict = Depends(get_current_user)):
     cursor = db.runs.find(
-        {"userId": ObjectId(user_id), "status": "completed"},
+        {"userId": user_oid, "status": "completed"},
         sort=[("endedAt", -1)],
         limit=50
     )
@@ -661,8 +1085,8 @@ async def get_user_runs(user_id: str, current_user: dict = Depends(get_current_u
 
 
 @api_router.get("/runs/detail/{run_id}")
-async def get_run_detail(run_id: str, current_user: dict = Depends(get_current_user)):
-    run = await db.runs.find_one({"_id": ObjectId(run_id)})
+async def get_run_detail(run_oid: ObjectId = Depends(run_id_path), current_user: dict = Depends(get_current_user)):
+    run = await db.runs.find_one({"_id": run_oid})
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     return serialize_doc(run)
@@ -679,35 +1103,30 @@ async def get_territories(
     maxLng: float = Query(...),
     maxLat: float = Query(...)
 ):
-    """Get all territories within a bounding box."""
-    try:
-        query = {
-            "polygon": {
-                "$geoIntersects": {
-                    "$geometry": {
-                        "type": "Polygon",
-                        "coordinates": [[
-                            [minLng, minLat],
-                            [maxLng, minLat],
-                            [maxLng, maxLat],
-                            [minLng, maxLat],
-                            [minLng, minLat]
-                        ]]
-                    }
+    """Get all territories within a bounding box, streamed as a JSON array."""
+    query = {
+        "polygon": {
+            "$geoIntersects": {
+                "$geometry": {
+                    "type": "Polygon",
+                    "coordinates": [[
+                        [minLng, minLat],
+                        [maxLng, minLat],
+                        [maxLng, maxLat],
+                        [minLng, maxLat],
+                        [minLng, minLat]
+                    ]]
                 }
             }
         }
-        cursor = db.territories.find(query, limit=200)
-        territories = await cursor.to_list(length=200)
-        return [serialize_doc(t) for t in territories]
-    except Exception as e:
-        logger.error(f"Territory fetch error: {e}")
-        return []
+    }
+    cursor = db.territories.find(query, projection=TERRITORY_PROJECTION, limit=200).batch_size(200)
+    return StreamingResponse(stream_json_array(cursor), media_type="application/json")
 
 
 @api_router.get("/territories/user/{user_id}")
-async def get_user_territories(user_id: str, current_user: dict = Depends(get_current_user)):
-    cursor = db.territories.find({"userId": ObjectId(user_id)})
+async def get_user_territories(user_oid: ObjectId = Depends(user_id_path), current_user: dict = Depends(get_current_user)):
+    cursor = db.territories.find({"userId": user_oid})
     territories = await cursor.to_list(length=500)
     return [serialize_doc(t) for t in territories]
 
@@ -718,32 +1137,27 @@ async def get_user_territories(user_id: str, current_user: dict = Depends(get_cu
 
 @api_router.get("/leaderboard/global")
 async def get_global_leaderboard(current_user: dict = Depends(get_current_user)):
-    pipeline = [
-        {"$sort": {"totalAreaKm2": -1}},
-        {"$limit": 50},
-        {"$project": {
-            "username": 1,
-            "totalAreaKm2": 1,
-            "totalDistanceKm": 1,
-            "totalRuns": 1,
-            "globalRank": 1,
-            "color": 1,
-            "createdAt": 1
-        }}
-    ]
-    users = await db.users.aggregate(pipeline).to_list(50)
+    cached = await cache_get("leaderboard:global")
+    if cached is not None:
+        return json_body_response(cached)
+
+    # batch_size matches the limit so the whole page arrives in one reply
+    cursor = db.users.find({}, projection=LEADERBOARD_PROJECTION).sort("totalAreaKm2", -1).limit(50).batch_size(50)
+    users = await cursor.to_list(length=50)
     result = []
     for i, u in enumerate(users):
         result.append({
             "rank": i + 1,
             "id": str(u["_id"]),
             "username": u["username"],
-            "totalAreaKm2": round(u.get("totalAreaKm2", 0), 4),
-            "totalDistanceKm": round(u.get("totalDistanceKm", 0), 2),
+            "totalAreaKm2": display_total(u, "totalAreaKm2", 4),
+            "totalDistanceKm": display_total(u, "totalDistanceKm", 2),
             "totalRuns": u.get("totalRuns", 0),
-            "color": u.get("color", "")
+            "color": u["color"]
         })
-    return result
+    body = orjson.dumps(result)
+    await cache_set("leaderboard:global", body, LEADERBOARD_CACHE_TTL)
+    return json_body_response(body)
 
 
 @api_router.get("/leaderboard/local")
@@ -753,42 +1167,44 @@ async def get_local_leaderboard(
     radius_km: float = Query(default=20),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get leaderboard for users with territory near a location."""
-    # Query territories near the point using $geoIntersects
+    """Get leaderboard for users with territory within radius_km of a location."""
+    # Bound territories by distance from the point using the 2dsphere index
     pipeline = [
-        {"$match": {
-            "polygon": {
-                "$geoIntersects": {
-                    "$geometry": {
-                        "type": "Point",
-                        "coordinates": [lng, lat]
-                    }
-                }
-            }
+        {"$geoNear": {
+            "near": {"type": "Point", "coordinates": [lng, lat]},
+            "distanceField": "distanceM",
+            "maxDistance": radius_km * 1000,
+            "spherical": True,
+            "key": "polygon"
         }},
         {"$group": {"_id": "$userId", "totalArea": {"$sum": "$areaKm2"}}},
         {"$sort": {"totalArea": -1}},
-        {"$limit": 50}
+        {"$limit": 50},
+        # Join user details server-side instead of one find_one per row
+        {"$lookup": {
+            "from": "users",
+            "localField": "_id",
+            "foreignField": "_id",
+            "as": "user",
+            "pipeline": [{"$project": {"username": 1, "totalDistanceKm": 1, "totalRuns": 1, "color": 1}}]
+        }},
+        {"$unwind": "$user"}
     ]
     
-    # Execute aggregation to get userId and totalArea
-    agg_results = await db.territories.aggregate(pipeline).to_list(100)
+    agg_results = await db.territories.aggregate(pipeline).to_list(50)
     
-    # Now fetch full user details for each userId
     result = []
     for idx, item in enumerate(agg_results):
-        user_id = item["_id"]
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-        if user:
-            result.append({
-                "rank": idx + 1,
-                "id": str(user["_id"]),
-                "username": user["username"],
-                "totalAreaKm2": item["totalArea"],
-                "totalDistanceKm": user.get("totalDistanceKm", 0.0),
-                "totalRuns": user.get("totalRuns", 0),
-                "color": user.get("color", user_color(str(user["_id"])))
-            })
+        user = item["user"]
+        result.append({
+            "rank": idx + 1,
+            "id": str(user["_id"]),
+            "username": user["username"],
+            "totalAreaKm2": item["totalArea"],
+            "totalDistanceKm": user.get("totalDistanceKm", 0.0),
+            "totalRuns": user.get("totalRuns", 0),
+            "color": user["color"]
+        })
     
     return result
 
@@ -797,34 +1213,47 @@ async def get_local_leaderboard(
 # USER PROFILE ROUTES
 # ============================================================
 
+def profile_response(user: Dict) -> Dict:
+    """Public profile fields of a user document (see PROFILE_PROJECTION)."""
+    g = user.get
+    return {
+        "id": str(user["_id"]),
+        "username": user["username"],
+        "email": g("email", ""),
+        "color": user["color"],
+        "totalAreaKm2": display_total(user, "totalAreaKm2", 4),
+        "totalDistanceKm": display_total(user, "totalDistanceKm", 2),
+        "totalRuns": g("totalRuns", 0),
+        "globalRank": g("globalRank", 0),
+        "currentStreak": g("currentStreak", 0),
+        "longestStreak": g("longestStreak", 0),
+        "createdAt": created_at_iso(user)
+    }
+
+
 @api_router.get("/users/{user_id}/profile")
-async def get_user_profile(user_id: str, current_user: dict = Depends(get_current_user)):
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
+async def get_user_profile(user_oid: ObjectId = Depends(user_id_path), current_user: dict = Depends(get_current_user)):
+    cache_key = f"profile:{user_oid}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return json_body_response(cached)
+
+    user = await user_batcher.get(user_oid)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    uid = str(user["_id"])
-    return {
-        "id": uid,
-        "username": user["username"],
-        "email": user.get("email", ""),
-        "color": user.get("color", user_color(uid)),
-        "totalAreaKm2": round(user.get("totalAreaKm2", 0), 4),
-        "totalDistanceKm": round(user.get("totalDistanceKm", 0), 2),
-        "totalRuns": user.get("totalRuns", 0),
-        "globalRank": user.get("globalRank", 0),
-        "currentStreak": user.get("currentStreak", 0),
-        "longestStreak": user.get("longestStreak", 0),
-        "createdAt": user["createdAt"].isoformat() if isinstance(user.get("createdAt"), datetime) else ""
-    }
+    body = orjson.dumps(profile_response(user))
+    await cache_set(cache_key, body, PROFILE_CACHE_TTL)
+    return json_body_response(body)
 
 
 @api_router.put("/users/{user_id}/profile")
 async def update_user_profile(
-    user_id: str,
-    req: UpdateProfileRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    user_oid: ObjectId = Depends(user_id_path),
+    req: UpdateProfileRequest = Depends(msgspec_body(UpdateProfileRequest))
 ):
+    user_id = str(user_oid)
     if current_user["user_id"] != user_id:
         raise HTTPException(status_code=403, detail="Forbidden")
 
@@ -834,10 +1263,23 @@ async def update_user_profile(
     if req.avatarUrl:
         update_data["avatarUrl"] = req.avatarUrl
 
-    if update_data:
-        await db.users.update_one({"_id": ObjectId(user_id)}, {"$set": update_data})
+    if not update_data:
+        return await get_user_profile(user_oid, current_user)
+
+    # Write and read back the updated profile in one command
+    user = await db.users.find_one_and_update(
+        {"_id": user_oid},
+        {"$set": update_data},
+        projection=PROFILE_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    await invalidate_user_cache(user_id)
 
-    return await get_user_profile(user_id, current_user)
+    body = orjson.dumps(profile_response(user))
+    await cache_set(f"profile:{user_id}", body, PROFILE_CACHE_TTL)
+    return json_body_response(body)
 
 
 # ============================================================
@@ -849,8 +1291,8 @@ async def update_user_profile(
 # ============================================================
 
 @api_router.get("/badges/{user_id}")
-async def get_user_badges(user_id: str, current_user: dict = Depends(get_current_user)):
-    badges = await db.badges.find({"userId": ObjectId(user_id)}, sort=[("earnedAt", -1)]).to_list(100)
+async def get_user_badges(user_oid: ObjectId = Depends(user_id_path), current_user: dict = Depends(get_current_user)):
+    badges = await db.badges.find({"userId": user_oid}, sort=[("earnedAt", -1)]).to_list(100)
     return [serialize_doc(b) for b in badges]
 
 
@@ -955,12 +1397,10 @@ async def mark_all_read(current_user: dict = Depends(get_current_user)):
 # TEST ROUTES
 # ============================================================
 
-@api_router.get("/test/territory")
-async def test_territory(
-    lat: float = Query(default=51.5074),
-    lng: float = Query(default=-0.1278)
-):
-    """Test territory computation with a fake square route."""
+@lru_cache(maxsize=1024)
+def compute_test_territory(lat_e6: int, lng_e6: int) -> bytes:
+    """Encoded /test/territory body for a location quantized to 1e-6 degrees."""
+    lat, lng = lat_e6 / 1e6, lng_e6 / 1e6
     delta = 0.001  # ~100m
     # Create a small square route
     coordinates = [
@@ -971,14 +1411,13 @@ async def test_territory(
         [lng, lat]
     ]
 
-    polygon = buffer_route_to_polygon(coordinates, buffer_km=0.05)
+    polygon, area_km2 = buffer_route_to_polygon(coordinates, buffer_km=0.05)
     if not polygon:
-        return {"error": "Could not compute territory"}
+        return orjson.dumps({"error": "Could not compute territory"})
 
-    area_km2 = calculate_area_km2(polygon)
     distance_km = calculate_route_distance_km(coordinates)
 
-    return {
+    return orjson.dumps({
         "status": "ok",
         "input": {"lat": lat, "lng": lng},
         "route": {"type": "LineString", "coordinates": coordinates},
@@ -986,7 +1425,17 @@ async def test_territory(
         "area_km2": round(area_km2, 6),
         "route_distance_km": round(distance_km, 3),
         "message": f"Territory of {round(area_km2, 4)} km² computed successfully"
-    }
+    })
+
+
+@api_router.get("/test/territory")
+async def test_territory(
+    lat: float = Query(default=51.5074),
+    lng: float = Query(default=-0.1278)
+):
+    """Test territory computation with a fake square route."""
+    # Deterministic per location, so repeat calls are served from the LRU cache
+    return json_body_response(compute_test_territory(round(lat * 1e6), round(lng * 1e6)))
 
 
 @api_router.get("/")
@@ -1000,7 +1449,10 @@ app.include_router(api_router)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+# GeoJSON coordinate arrays compress several-fold; small bodies are left as-is
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
@@ -0,0 +1,22 @@
+"""Numba-compiled numeric kernels used by the geo utilities in server.py."""
+import math
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def haversine_sum(lat, lng):
+    """Total haversine length in km of a track given as lat/lng radian arrays."""
+    R = 6371.0
+    s = 0.0
+    for i in range(1, lat.size):
+        dlat = lat[i] - lat[i - 1]
+        dlng = lng[i] - lng[i - 1]
+        a = math.sin(dlat / 2) ** 2 + math.cos(lat[i - 1]) * math.cos(lat[i]) * math.sin(dlng / 2) ** 2
+        s += 2 * math.asin(math.sqrt(min(max(a, 0.0), 1.0)))
+    return R * s
+
+
+# Warm the JIT at import so the first /runs/end isn't penalized
+haversine_sum(np.zeros(2), np.zeros(2))
@@ -4,7 +4,8 @@ SUPERACRES Backend API Test Suite
 Testing all backend endpoints comprehensively
 """
 
-import requests
+import asyncio
+import httpx
 import json
 import time
 from datetime import datetime
@@ -32,10 +33,10 @@ class SuperacresAPITester:
         if details:
             print(f"    Details: {details}")
     
-    def test_api_root(self):
+    async def test_api_root(self, client):
         """Test GET /api/"""
         try:
-            response = requests.get(f"{BASE_URL}/")
+            response = await client.get("/")
             if response.status_code == 200:
                 data = response.json()
                 expected_message = "SUPERACRES API v1.0"
@@ -48,11 +49,11 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("API Root Endpoint", False, f"Request failed: {str(e)}")
     
-    def test_territory_computation(self):
+    async def test_territory_computation(self, client):
         """Test GET /api/test/territory"""
         try:
             params = {"lat": 51.5074, "lng": -0.1278}
-            response = requests.get(f"{BASE_URL}/test/territory", params=params)
+            response = await client.get("/test/territory", params=params)
             if response.status_code == 200:
                 data = response.json()
                 if data.get("status") == "ok" and "territory" in data and "area_km2" in data:
@@ -64,7 +65,7 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("Test Territory Computation", False, f"Request failed: {str(e)}")
     
-    def test_user_registration(self):
+    async def test_user_registration(self, client):
         """Test POST /api/auth/register"""
         try:
             # Create unique test user
@@ -74,7 +75,7 @@ class SuperacresAPITester:
                 "email": f"testrunner{timestamp}@superacres.com",
                 "password": "TestRunner123!"
             }
-            response = requests.post(f"{BASE_URL}/auth/register", json=user_data)
+            response = await client.post("/auth/register", json=user_data)
             if response.status_code == 200:
                 data = response.json()
                 if "token" in data and "user" in data:
@@ -88,7 +89,7 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("User Registration", False, f"Request failed: {str(e)}")
     
-    def test_user_login(self):
+    async def test_user_login(self, client):
         """Test POST /api/auth/login - using the same user created in registration"""
         try:
             timestamp = str(int(time.time()))
@@ -96,7 +97,7 @@ class SuperacresAPITester:
                 "email": f"testrunner{timestamp}@superacres.com",
                 "password": "TestRunner123!"
             }
-            response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
+            response = await client.post("/auth/login", json=login_data)
             if response.status_code == 200:
                 data = response.json()
                 if "token" in data and "user" in data:
@@ -110,7 +111,7 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("User Login", False, f"Request failed: {str(e)}")
     
-    def test_get_current_user(self):
+    async def test_get_current_user(self, client):
         """Test GET /api/auth/me"""
         if not self.token:
             self.log_test("Get Current User", False, "No auth token available")
@@ -118,7 +119,7 @@ class SuperacresAPITester:
             
         try:
             headers = {"Authorization": f"Bearer {self.token}"}
-            response = requests.get(f"{BASE_URL}/auth/me", headers=headers)
+            response = await client.get("/auth/me", headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 required_fields = ["id", "username", "email", "totalAreaKm2", "totalDistanceKm", "totalRuns"]
@@ -132,7 +133,7 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("Get Current User", False, f"Request failed: {str(e)}")
     
-    def test_start_run(self):
+    async def test_start_run(self, client):
         """Test POST /api/runs/start"""
         if not self.token:
             self.log_test("Start Run", False, "No auth token available")
@@ -140,7 +141,7 @@ class SuperacresAPITester:
             
         try:
             headers = {"Authorization": f"Bearer {self.token}"}
-            response = requests.post(f"{BASE_URL}/runs/start", json={}, headers=headers)
+            response = await client.post("/runs/start", json={}, headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 if "runId" in data and "startedAt" in data:
@@ -153,7 +154,7 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("Start Run", False, f"Request failed: {str(e)}")
     
-    def test_end_run(self):
+    async def test_end_run(self, client):
         """Test POST /api/runs/end"""
         if not self.token or not self.run_id:
             self.log_test("End Run", False, "No auth token or run ID available")
@@ -172,7 +173,7 @@ class SuperacresAPITester:
                     [-0.126, 51.5084],   # End point
                 ]
             }
-            response = requests.post(f"{BASE_URL}/runs/end", json=run_data, headers=headers)
+            response = await client.post("/runs/end", json=run_data, headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 if "run" in data and "territoryGained" in data:
@@ -186,7 +187,7 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("End Run", False, f"Request failed: {str(e)}")
     
-    def test_global_leaderboard(self):
+    async def test_global_leaderboard(self, client):
         """Test GET /api/leaderboard/global"""
         if not self.token:
             self.log_test("Global Leaderboard", False, "No auth token available")
@@ -194,7 +195,7 @@ class SuperacresAPITester:
             
         try:
             headers = {"Authorization": f"Bearer {self.token}"}
-            response = requests.get(f"{BASE_URL}/leaderboard/global", headers=headers)
+            response = await client.get("/leaderboard/global", headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 if isinstance(data, list):
@@ -207,7 +208,7 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("Global Leaderboard", False, f"Request failed: {str(e)}")
     
-    def test_territories_bbox(self):
+    async def test_territories_bbox(self, client):
         """Test GET /api/territories"""
         try:
             # London area bounding box
@@ -217,7 +218,7 @@ class SuperacresAPITester:
                 "maxLng": -0.10,
                 "maxLat": 51.52
             }
-            response = requests.get(f"{BASE_URL}/territories", params=params)
+            response = await client.get("/territories", params=params)
             if response.status_code == 200:
                 data = response.json()
                 if isinstance(data, list):
@@ -229,7 +230,7 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("Territories Bounding Box", False, f"Request failed: {str(e)}")
     
-    def test_user_profile(self):
+    async def test_user_profile(self, client):
         """Test GET /api/users/{userId}/profile"""
         if not self.token or not self.user_id:
             self.log_test("User Profile", False, "No auth token or user ID available")
@@ -237,7 +238,7 @@ class SuperacresAPITester:
             
         try:
             headers = {"Authorization": f"Bearer {self.token}"}
-            response = requests.get(f"{BASE_URL}/users/{self.user_id}/profile", headers=headers)
+            response = await client.get(f"/users/{self.user_id}/profile", headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 required_fields = ["id", "username", "email", "totalAreaKm2", "totalDistanceKm", "totalRuns"]
@@ -251,26 +252,35 @@ class SuperacresAPITester:
         except Exception as e:
             self.log_test("User Profile", False, f"Request failed: {str(e)}")
     
-    def run_all_tests(self):
-        """Run all backend tests in sequence"""
+    async def run_all_tests(self):
+        """Run all backend tests, concurrently where they don't depend on each other"""
         print(f"🚀 Starting SUPERACRES Backend API Tests")
         print(f"🌐 Backend URL: {BASE_URL}")
         print("=" * 60)
         
-        # Test endpoints in logical order
-        self.test_api_root()
-        self.test_territory_computation()
-        self.test_user_registration()
-        
-        # Note: We can't test login separately with a new user
-        # because we need the same credentials from registration
-        
-        self.test_get_current_user()
-        self.test_start_run()
-        self.test_end_run()
-        self.test_global_leaderboard()
-        self.test_territories_bbox()
-        self.test_user_profile()
+        # One client for the whole suite so connections are reused
+        async with httpx.AsyncClient(base_url=BASE_URL, http2=True, timeout=10) as client:
+            # Unauthenticated checks are independent
+            await asyncio.gather(
+                self.test_api_root(client),
+                self.test_territory_computation(client),
+            )
+            
+            # Note: We can't test login separately with a new user
+            # because we need the same credentials from registration
+            
+            # Auth and run flow: each step needs the previous one's token/run ID
+            await self.test_user_registration(client)
+            await self.test_get_current_user(client)
+            await self.test_start_run(client)
+            await self.test_end_run(client)
+            
+            # Read-only checks after the run
+            await asyncio.gather(
+                self.test_global_leaderboard(client),
+                self.test_territories_bbox(client),
+                self.test_user_profile(client),
+            )
         
         print("=" * 60)
         self.print_summary()
@@ -295,4 +305,4 @@ class SuperacresAPITester:
 
 if __name__ == "__main__":
     tester = SuperacresAPITester()
-    tester.run_all_tests()
\ No newline at end of file
+    asyncio.run(tester.run_all_tests())
\ No newline at end of file